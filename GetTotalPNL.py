@@ -7,277 +7,506 @@ Supports multiple files and automatic chunk processing
 
 import csv
 import argparse
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from decimal import Decimal, InvalidOperation
-from collections import defaultdict, OrderedDict
-import statistics
-import json
+from collections import OrderedDict
 from pathlib import Path
 import re
-import glob
+
+import numpy as np
+import orjson
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+from numba import njit, prange, get_num_threads, get_thread_id
+
+# Revenue sources recognised by the monthly report (all possible revenue event types)
+REVENUE_SOURCES = ['doghouse', 'lottery', 'pumpup', 'raffle', 'bucket_staking',
+                   'suilotto_bucket_interest', 'unihouse_reward', 'gas_rebates',
+                   'interest_withdraw', 'liquid-staking']
+
+# Column order of the per-month accumulator vectors
+MONTHLY_CATEGORY_FIELDS = (['Pre-Unihouse PNL']
+                           + [f'Revenue_{source}' for source in REVENUE_SOURCES]
+                           + ['Staking PNL', 'Fee PNL', 'Referral Fee'])
+
+def monthly_category_index(tx_type):
+    """Map a transaction type to its MONTHLY_CATEGORY_FIELDS column, or -1"""
+    if tx_type.startswith('Pre-Unihouse:'):
+        return 0
+    if tx_type.startswith('Revenue Event:'):
+        source = tx_type.replace('Revenue Event:', '')
+        if source in REVENUE_SOURCES:
+            return 1 + REVENUE_SOURCES.index(source)
+        return -1
+    if tx_type == 'Staking Revenue':
+        return MONTHLY_CATEGORY_FIELDS.index('Staking PNL')
+    if tx_type == 'Fee Revenue':
+        return MONTHLY_CATEGORY_FIELDS.index('Fee PNL')
+    if tx_type == 'Referral Fee':
+        return MONTHLY_CATEGORY_FIELDS.index('Referral Fee')
+    return -1
+
+@njit(parallel=True)
+def _fused_aggregate(pnl, day_idx, hour, month_idx, type_codes, n_days, n_months, n_types):
+    """Accumulate the daily/hourly/monthly/type aggregates and the grand total
+    in a single pass over the PNL column, so the array is read from memory
+    once instead of once per aggregation"""
+    n_threads = get_num_threads()
+    day_sums = np.zeros((n_threads, n_days))
+    day_counts = np.zeros((n_threads, n_days), dtype=np.int64)
+    hour_sums = np.zeros((n_threads, 24))
+    hour_counts = np.zeros((n_threads, 24), dtype=np.int64)
+    month_sums = np.zeros((n_threads, n_months))
+    month_counts = np.zeros((n_threads, n_months), dtype=np.int64)
+    type_sums = np.zeros((n_threads, n_types))
+    type_counts = np.zeros((n_threads, n_types), dtype=np.int64)
+    total = 0.0
+    for i in prange(len(pnl)):
+        thread = get_thread_id()
+        value = pnl[i]
+        day_sums[thread, day_idx[i]] += value
+        day_counts[thread, day_idx[i]] += 1
+        hour_sums[thread, hour[i]] += value
+        hour_counts[thread, hour[i]] += 1
+        month_sums[thread, month_idx[i]] += value
+        month_counts[thread, month_idx[i]] += 1
+        type_sums[thread, type_codes[i]] += value
+        type_counts[thread, type_codes[i]] += 1
+        total += value
+    return (day_sums.sum(axis=0), day_counts.sum(axis=0),
+            hour_sums.sum(axis=0), hour_counts.sum(axis=0),
+            month_sums.sum(axis=0), month_counts.sum(axis=0),
+            type_sums.sum(axis=0), type_counts.sum(axis=0), total)
+
+@njit(parallel=True)
+def _accumulate_monthly_categories(pnl, month_idx, category, n_months, n_categories):
+    """Scatter-add PNL into a dense (month, category) matrix in one native
+    pass, with per-thread partials reduced at the end"""
+    n_threads = get_num_threads()
+    partials = np.zeros((n_threads, n_months, n_categories))
+    for i in prange(len(pnl)):
+        cat = category[i]
+        if cat >= 0:
+            partials[get_thread_id(), month_idx[i], cat] += pnl[i]
+    return partials.sum(axis=0)
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+ARROW_COLUMNS = ['Timestamp', 'Type', 'PNL USD']
+
+def _parse_csv_file(csv_file):
+    """Parse one CSV file into an arrow Table. Module-level and free of shared
+    state so it can run in a worker process; returns (table, file_stats,
+    invalid_records), with table None on failure."""
+    try:
+        # Validate required columns before the full parse
+        header = pd.read_csv(csv_file, nrows=0)
+        required_columns = ['PNL USD', 'Timestamp', 'Type']
+        missing_columns = [col for col in required_columns if col not in header.columns]
+        if missing_columns:
+            print(f"Error: Missing required columns in {csv_file}: {missing_columns}")
+            print(f"Available columns: {list(header.columns)}")
+            return None, None, None
+
+        try:
+            table = pa_csv.read_csv(
+                csv_file,
+                read_options=pa_csv.ReadOptions(use_threads=True, block_size=4 << 20),
+                convert_options=pa_csv.ConvertOptions(
+                    include_columns=ARROW_COLUMNS,
+                    # Pinning the format skips arrow's per-value ISO fallbacks
+                    timestamp_parsers=[TIMESTAMP_FORMAT],
+                    # Dictionary encoding stores each repeated type string once
+                    column_types={'PNL USD': pa.float64(),
+                                  'Timestamp': pa.timestamp('s'),
+                                  'Type': pa.dictionary(pa.int32(), pa.string())}))
+        except pa.ArrowInvalid:
+            # A malformed value poisons the whole arrow conversion; re-read
+            # with the coercing pandas parser so bad rows can be reported
+            table = _parse_csv_file_coerced(csv_file)
+
+        file_record_count = len(table)
+        invalid_records = []
+
+        # Empty/null PNL or Timestamp cells surface as nulls; drop and report
+        valid_mask = pc.and_(pc.is_valid(table.column('PNL USD')),
+                             pc.is_valid(table.column('Timestamp')))
+        if pc.any(pc.invert(valid_mask)).as_py():
+            for idx in pc.indices_nonzero(pc.invert(valid_mask)).to_pylist()[:100]:
+                invalid_records.append({
+                    'row_number': idx + 1,
+                    'error': 'unparseable PNL or Timestamp',
+                    'raw_data': None,
+                    'source_file': csv_file
+                })
+            table = table.filter(valid_mask)
+
+        file_stats = {
+            'total_records': file_record_count,
+            'valid_records': len(table),
+            'invalid_records': file_record_count - len(table)
+        }
+        return table, file_stats, invalid_records
+
+    except FileNotFoundError:
+        print(f"Error: File '{csv_file}' not found")
+        return None, None, None
+    except Exception as e:
+        print(f"Error reading CSV file {csv_file}: {e}")
+        return None, None, None
+
+def _parse_csv_file_coerced(csv_file):
+    """Fallback parser that coerces malformed cells to null instead of raising"""
+    frame = pd.read_csv(csv_file, usecols=ARROW_COLUMNS, engine='c')
+    frame['PNL USD'] = pd.to_numeric(frame['PNL USD'], errors='coerce')
+    frame['Timestamp'] = pd.to_datetime(frame['Timestamp'], format=TIMESTAMP_FORMAT,
+                                        errors='coerce', cache=True)
+    # pandas reads an empty Type cell as NaN; the arrow path keeps it as the
+    # literal empty string, so normalize before dictionary-encoding
+    frame['Type'] = frame['Type'].fillna('').astype('category')
+    schema = pa.schema([('Timestamp', pa.timestamp('s')),
+                        ('Type', pa.dictionary(pa.int32(), pa.string())),
+                        ('PNL USD', pa.float64())])
+    return pa.Table.from_pandas(frame[ARROW_COLUMNS], schema=schema,
+                                preserve_index=False)
 
 class PNLAnalyzer:
     def __init__(self, csv_files):
         self.csv_files = csv_files if isinstance(csv_files, list) else [csv_files]
-        self.data = []
-        self.total_pnl = Decimal('0')
+        self.total_pnl = 0.0
         self.record_count = 0
         self.valid_pnl_count = 0
-        self.invalid_records = []
-        self.pnl_values = []
-        self.daily_pnl = defaultdict(Decimal)
-        self.type_pnl = defaultdict(Decimal)
-        self.type_counts = defaultdict(int)
-        self.hourly_pnl = defaultdict(Decimal)
-        self.monthly_pnl = defaultdict(Decimal)
+        self.invalid_record_count = 0
+        self.invalid_records = []  # Capped sample; the counter holds the true total
+        # Struct-of-arrays storage: one typed column per field
+        self.pnl_values = np.empty(0, dtype=np.float64)
+        self.ts_arr = np.empty(0, dtype='datetime64[s]')
+        self.type_codes = np.empty(0, dtype=np.int32)
+        self.type_to_code = {}
+        self.type_names = []
+        self.src_arr = np.empty(0, dtype=np.int16)
+        self.file_names = []
+        # Aggregates accumulated while files stream through ingestion
+        self.first_ts = None
+        self.last_ts = None
+        self.monthly_category_pnl = {}
+        # Time aggregates as parallel (keys, sums) arrays; dicts are built
+        # only where a report needs a keyed breakdown
+        self.daily_keys = np.empty(0, dtype='datetime64[D]')
+        self.daily_sums = np.empty(0, dtype=np.float64)
+        self.hourly_keys = np.empty(0, dtype=np.int64)
+        self.hourly_sums = np.empty(0, dtype=np.float64)
+        self.monthly_keys = np.empty(0, dtype=object)
+        self.monthly_sums = np.empty(0, dtype=np.float64)
+        self.type_pnl = {}
+        self.type_counts = {}
         self.file_stats = {}  # Track stats per file
-        
+
     def load_data(self):
         """Load and parse CSV data from multiple files with progress tracking"""
         print(f"Loading data from {len(self.csv_files)} file(s)...")
         print("This may take a moment for large files...")
-        
+
         total_files = len(self.csv_files)
-        
-        for file_idx, csv_file in enumerate(self.csv_files, 1):
+
+        # Chunk files are independent, so parse them in separate interpreters;
+        # only the merge below touches shared state
+        max_workers = min(total_files, os.cpu_count() or 1)
+        if max_workers > 1:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(_parse_csv_file, self.csv_files))
+        else:
+            results = [_parse_csv_file(csv_file) for csv_file in self.csv_files]
+
+        # Every file is parsed by now, so the final row count is known up
+        # front; preallocate the column arrays once and fill them by slice
+        total_valid = sum(file_stats['valid_records']
+                          for table, file_stats, _ in results if table is not None)
+        self.pnl_values = np.empty(total_valid, dtype=np.float64)
+        self.ts_arr = np.empty(total_valid, dtype='datetime64[s]')
+        self.type_codes = np.empty(total_valid, dtype=np.int32)
+        self.src_arr = np.empty(total_valid, dtype=np.int16)
+        offset = 0
+
+        for file_idx, (csv_file, (table, file_stats, invalid_records)) in enumerate(
+                zip(self.csv_files, results), 1):
             print(f"\nProcessing file {file_idx}/{total_files}: {csv_file}")
-            
-            if not self._load_single_file(csv_file):
+            if table is None:
                 print(f"Failed to load {csv_file}")
                 continue
-        
+
+            self.record_count += file_stats['total_records']
+            self.valid_pnl_count += file_stats['valid_records']
+            self.file_stats[csv_file] = file_stats
+            self.invalid_record_count += file_stats['invalid_records']
+            self.invalid_records.extend(invalid_records)
+            print(f"  Completed {csv_file}: {file_stats['total_records']:,} records, "
+                  f"{file_stats['valid_records']:,} valid")
+
+            # Reduce the table to typed columns immediately; nothing row-shaped
+            # (and no Digest strings) is retained past this point
+            pnl, ts, codes = self._ingest_table(table, csv_file)
+            end = offset + len(pnl)
+            self.pnl_values[offset:end] = pnl
+            self.ts_arr[offset:end] = ts
+            self.type_codes[offset:end] = codes
+            self.src_arr[offset:end] = len(self.file_names) - 1
+            offset = end
+
         if self.valid_pnl_count == 0:
             print("No valid data found in any files!")
             return False
-        
+
+        self.type_names = list(self.type_to_code)
+        self._build_aggregates()
+
         print(f"\nData loading complete! Processed {self.record_count:,} total records across {len(self.csv_files)} files.")
         return True
-    
-    def _load_single_file(self, csv_file):
-        """Load data from a single CSV file"""
-        file_record_count = 0
-        file_valid_count = 0
-        
-        try:
-            with open(csv_file, 'r', encoding='utf-8') as file:
-                csv_reader = csv.DictReader(file)
-                
-                # Validate required columns
-                required_columns = ['PNL USD', 'Timestamp', 'Type']
-                missing_columns = [col for col in required_columns if col not in csv_reader.fieldnames]
-                if missing_columns:
-                    print(f"Error: Missing required columns in {csv_file}: {missing_columns}")
-                    print(f"Available columns: {csv_reader.fieldnames}")
-                    return False
-                
-                # Process each row with progress tracking
-                for i, row in enumerate(csv_reader):
-                    if i % 100000 == 0 and i > 0:
-                        print(f"  Processed {i:,} records in {csv_file}...")
-                    
-                    self.record_count += 1
-                    file_record_count += 1
-                    
-                    try:
-                        # Parse PNL value
-                        pnl_str = row['PNL USD'].strip()
-                        if not pnl_str:
-                            continue
-                            
-                        pnl_value = Decimal(pnl_str)
-                        
-                        # Parse timestamp
-                        timestamp_str = row['Timestamp'].strip()
-                        timestamp = datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S')
-                        
-                        # Parse transaction type
-                        tx_type = row['Type'].strip()
-                        
-                        # Store data
-                        record = {
-                            'pnl': pnl_value,
-                            'timestamp': timestamp,
-                            'type': tx_type,
-                            'digest': row.get('Digest', '').strip(),
-                            'source_file': csv_file
-                        }
-                        
-                        self.data.append(record)
-                        self.total_pnl += pnl_value
-                        self.pnl_values.append(float(pnl_value))
-                        self.valid_pnl_count += 1
-                        file_valid_count += 1
-                        
-                        # Aggregate by different time periods
-                        date_key = timestamp.date()
-                        self.daily_pnl[date_key] += pnl_value
-                        
-                        hour_key = timestamp.hour
-                        self.hourly_pnl[hour_key] += pnl_value
-                        
-                        month_key = timestamp.strftime('%Y-%m')
-                        self.monthly_pnl[month_key] += pnl_value
-                        
-                        # Aggregate by transaction type
-                        self.type_pnl[tx_type] += pnl_value
-                        self.type_counts[tx_type] += 1
-                        
-                    except (InvalidOperation, ValueError, KeyError) as e:
-                        self.invalid_records.append({
-                            'row_number': self.record_count,
-                            'error': str(e),
-                            'raw_data': row,
-                            'source_file': csv_file
-                        })
-                        continue
-                
-                # Store file statistics
-                self.file_stats[csv_file] = {
-                    'total_records': file_record_count,
-                    'valid_records': file_valid_count,
-                    'invalid_records': file_record_count - file_valid_count
-                }
-                
-                print(f"  Completed {csv_file}: {file_record_count:,} records, {file_valid_count:,} valid")
-                return True
-                
-        except FileNotFoundError:
-            print(f"Error: File '{csv_file}' not found")
-            return False
-        except Exception as e:
-            print(f"Error reading CSV file {csv_file}: {e}")
-            return False
-    
+
+    def _ingest_table(self, table, csv_file):
+        """Reduce a parsed table to typed arrays and fold it into the running
+        aggregates, so no per-row structures outlive ingestion"""
+        pnl = table.column('PNL USD').to_numpy(zero_copy_only=False)
+        ts = table.column('Timestamp').to_numpy(zero_copy_only=False)
+        # The Type column is dictionary-encoded, so per-row codes come straight
+        # from the indices and only the distinct strings are ever materialized
+        type_col = table.column('Type').combine_chunks()
+        local_types = type_col.dictionary.to_pylist()
+        if type_col.null_count:
+            # A null type (empty cell) is a valid record with type ''
+            null_code = len(local_types)
+            local_types.append('')
+            indices = type_col.indices.to_numpy(zero_copy_only=False)
+            local_codes = np.where(np.isnan(indices), null_code, indices).astype(np.int64)
+        else:
+            local_codes = type_col.indices.to_numpy()
+
+        # Remap this file's type codes onto the global (interned) code table
+        remap = np.empty(len(local_types), dtype=np.int32)
+        for local_code, tx_type in enumerate(local_types):
+            tx_type = sys.intern(tx_type)
+            remap[local_code] = self.type_to_code.setdefault(tx_type, len(self.type_to_code))
+        codes = remap[local_codes]
+
+        # Running date range as scalars; the report never needs the rows back
+        if len(ts):
+            file_first, file_last = ts.min(), ts.max()
+            if self.first_ts is None or file_first < self.first_ts:
+                self.first_ts = file_first
+            if self.last_ts is None or file_last > self.last_ts:
+                self.last_ts = file_last
+
+        # Fold this file into the per-month category totals. The category of a
+        # row depends only on its type, so categorize the handful of distinct
+        # types, then let the jitted kernel scatter-add the per-row PNL into a
+        # dense (month, category) matrix.
+        if len(ts):
+            category_per_type = np.array([monthly_category_index(t) for t in local_types],
+                                         dtype=np.int8)
+            categories = category_per_type[local_codes]
+            month_codes = ts.astype('datetime64[M]').astype(np.int64)
+            first_month = month_codes.min()
+            month_idx = (month_codes - first_month).astype(np.int32)
+            n_months = int(month_idx.max()) + 1
+            month_sums = _accumulate_monthly_categories(
+                pnl, month_idx, categories, n_months, len(MONTHLY_CATEGORY_FIELDS))
+            months_present = np.bincount(month_idx, minlength=n_months) > 0
+            for offset in np.nonzero(months_present)[0]:
+                month = str(np.datetime64(int(first_month) + int(offset), 'M'))
+                bucket = self.monthly_category_pnl.setdefault(
+                    month, np.zeros(len(MONTHLY_CATEGORY_FIELDS)))
+                bucket += month_sums[offset]
+
+        self.file_names.append(csv_file)
+        return pnl, ts, codes
+
+    def _build_aggregates(self):
+        """Build all time/type aggregates from the typed column arrays"""
+        if not len(self.pnl_values):
+            return
+
+        # Dense day/month indices relative to the first period, plus the hour
+        # of day, all derived with vectorized datetime64 casts
+        day_codes = self.ts_arr.astype('datetime64[D]').astype(np.int64)
+        first_day = day_codes.min()
+        day_idx = (day_codes - first_day).astype(np.int32)
+        hours = (self.ts_arr.astype('datetime64[h]').astype(np.int64)
+                 - day_codes * 24).astype(np.int32)
+        month_codes = self.ts_arr.astype('datetime64[M]').astype(np.int64)
+        first_month = month_codes.min()
+        month_idx = (month_codes - first_month).astype(np.int32)
+
+        (day_sums, day_counts, hour_sums, hour_counts, month_sums, month_counts,
+         type_sums, type_counts, total) = _fused_aggregate(
+            self.pnl_values, day_idx, hours, month_idx, self.type_codes,
+            int(day_idx.max()) + 1, int(month_idx.max()) + 1, len(self.type_names))
+
+        self.total_pnl = float(total)
+
+        days_present = np.nonzero(day_counts)[0]
+        self.daily_keys = (first_day + days_present).astype('datetime64[D]')
+        self.daily_sums = day_sums[days_present]
+
+        self.hourly_keys = np.nonzero(hour_counts)[0]
+        self.hourly_sums = hour_sums[self.hourly_keys]
+
+        months_present = np.nonzero(month_counts)[0]
+        self.monthly_keys = np.datetime_as_string(
+            (first_month + months_present).astype('datetime64[M]'), unit='M')
+        self.monthly_sums = month_sums[months_present]
+
+        self.type_pnl = dict(zip(self.type_names, type_sums))
+        self.type_counts = {tx_type: int(n) for tx_type, n in zip(self.type_names, type_counts)}
+
     def calculate_statistics(self):
         """Calculate comprehensive statistics"""
-        if not self.pnl_values:
+        if not len(self.pnl_values):
             return {}
-        
-        pnl_sorted = sorted(self.pnl_values)
-        
+
+        # Partition-based selection instead of a full sort of every value
+        p25, p75, p90, p95, p99 = np.percentile(self.pnl_values, [25, 75, 90, 95, 99])
+        pnl_min = float(self.pnl_values.min())
+        pnl_max = float(self.pnl_values.max())
+
+        unique_values, unique_counts = np.unique(self.pnl_values, return_counts=True)
+        mode = float(unique_values[unique_counts.argmax()]) if unique_counts.max() > 1 else None
+
         return {
-            'total': float(self.total_pnl),
+            'total': self.total_pnl,
             'count': self.valid_pnl_count,
-            'mean': statistics.mean(self.pnl_values),
-            'median': statistics.median(self.pnl_values),
-            'mode': statistics.mode(self.pnl_values) if len(set(self.pnl_values)) < len(self.pnl_values) else None,
-            'std_dev': statistics.stdev(self.pnl_values) if len(self.pnl_values) > 1 else 0,
-            'variance': statistics.variance(self.pnl_values) if len(self.pnl_values) > 1 else 0,
-            'min': min(self.pnl_values),
-            'max': max(self.pnl_values),
-            'range': max(self.pnl_values) - min(self.pnl_values),
-            'percentile_25': pnl_sorted[len(pnl_sorted) // 4],
-            'percentile_75': pnl_sorted[3 * len(pnl_sorted) // 4],
-            'percentile_90': pnl_sorted[9 * len(pnl_sorted) // 10],
-            'percentile_95': pnl_sorted[95 * len(pnl_sorted) // 100],
-            'percentile_99': pnl_sorted[99 * len(pnl_sorted) // 100],
+            'mean': float(self.pnl_values.mean()),
+            'median': float(np.median(self.pnl_values)),
+            'mode': mode,
+            'std_dev': float(self.pnl_values.std(ddof=1)) if len(self.pnl_values) > 1 else 0,
+            'variance': float(self.pnl_values.var(ddof=1)) if len(self.pnl_values) > 1 else 0,
+            'min': pnl_min,
+            'max': pnl_max,
+            'range': pnl_max - pnl_min,
+            'percentile_25': float(p25),
+            'percentile_75': float(p75),
+            'percentile_90': float(p90),
+            'percentile_95': float(p95),
+            'percentile_99': float(p99),
         }
-    
+
     def analyze_profit_loss(self):
         """Analyze profit vs loss breakdown"""
-        profits = [x for x in self.pnl_values if x > 0]
-        losses = [x for x in self.pnl_values if x < 0]
-        breakeven = [x for x in self.pnl_values if x == 0]
-        
+        profits = self.pnl_values[self.pnl_values > 0]
+        losses = self.pnl_values[self.pnl_values < 0]
+        n_profit = len(profits)
+        n_loss = len(losses)
+        avg_profit = float(profits.mean()) if n_profit else 0
+        avg_loss = float(losses.mean()) if n_loss else 0
+
         return {
-            'profit_transactions': len(profits),
-            'loss_transactions': len(losses),
-            'breakeven_transactions': len(breakeven),
-            'total_profit': sum(profits),
-            'total_loss': sum(losses),
-            'win_rate': len(profits) / len(self.pnl_values) * 100 if self.pnl_values else 0,
-            'avg_profit': statistics.mean(profits) if profits else 0,
-            'avg_loss': statistics.mean(losses) if losses else 0,
-            'largest_profit': max(profits) if profits else 0,
-            'largest_loss': min(losses) if losses else 0,
-            'profit_loss_ratio': abs(statistics.mean(profits) / statistics.mean(losses)) if profits and losses else 0
+            'profit_transactions': n_profit,
+            'loss_transactions': n_loss,
+            'breakeven_transactions': int((self.pnl_values == 0).sum()),
+            'total_profit': float(profits.sum()),
+            'total_loss': float(losses.sum()),
+            'win_rate': n_profit / len(self.pnl_values) * 100 if len(self.pnl_values) else 0,
+            'avg_profit': avg_profit,
+            'avg_loss': avg_loss,
+            'largest_profit': float(profits.max()) if n_profit else 0,
+            'largest_loss': float(losses.min()) if n_loss else 0,
+            'profit_loss_ratio': abs(avg_profit / avg_loss) if n_profit and n_loss else 0
         }
-    
+
     def analyze_time_performance(self):
         """Analyze performance by time periods"""
         # Daily analysis
         daily_stats = {}
-        if self.daily_pnl:
-            daily_values = [float(v) for v in self.daily_pnl.values()]
+        if len(self.daily_sums):
+            best = self.daily_sums.argmax()
+            worst = self.daily_sums.argmin()
             daily_stats = {
-                'best_day': max(self.daily_pnl.items(), key=lambda x: x[1]),
-                'worst_day': min(self.daily_pnl.items(), key=lambda x: x[1]),
-                'avg_daily_pnl': statistics.mean(daily_values),
-                'daily_volatility': statistics.stdev(daily_values) if len(daily_values) > 1 else 0,
-                'profitable_days': len([v for v in daily_values if v > 0]),
-                'total_days': len(daily_values)
+                'best_day': (self.daily_keys[best].astype(object), float(self.daily_sums[best])),
+                'worst_day': (self.daily_keys[worst].astype(object), float(self.daily_sums[worst])),
+                'avg_daily_pnl': float(self.daily_sums.mean()),
+                'daily_volatility': float(self.daily_sums.std(ddof=1)) if len(self.daily_sums) > 1 else 0,
+                'profitable_days': int((self.daily_sums > 0).sum()),
+                'total_days': len(self.daily_sums)
             }
-        
+
         # Hourly analysis
         hourly_stats = {}
-        if self.hourly_pnl:
+        if len(self.hourly_sums):
+            best = self.hourly_sums.argmax()
+            worst = self.hourly_sums.argmin()
             hourly_stats = {
-                'best_hour': max(self.hourly_pnl.items(), key=lambda x: x[1]),
-                'worst_hour': min(self.hourly_pnl.items(), key=lambda x: x[1]),
-                'hourly_breakdown': dict(self.hourly_pnl)
+                'best_hour': (int(self.hourly_keys[best]), float(self.hourly_sums[best])),
+                'worst_hour': (int(self.hourly_keys[worst]), float(self.hourly_sums[worst])),
+                'hourly_breakdown': dict(zip(self.hourly_keys.tolist(), self.hourly_sums))
             }
-        
+
         # Monthly analysis
         monthly_stats = {}
-        if self.monthly_pnl:
-            monthly_values = [float(v) for v in self.monthly_pnl.values()]
+        if len(self.monthly_sums):
+            best = self.monthly_sums.argmax()
+            worst = self.monthly_sums.argmin()
             monthly_stats = {
-                'best_month': max(self.monthly_pnl.items(), key=lambda x: x[1]),
-                'worst_month': min(self.monthly_pnl.items(), key=lambda x: x[1]),
-                'avg_monthly_pnl': statistics.mean(monthly_values),
-                'monthly_breakdown': dict(self.monthly_pnl)
+                'best_month': (self.monthly_keys[best], float(self.monthly_sums[best])),
+                'worst_month': (self.monthly_keys[worst], float(self.monthly_sums[worst])),
+                'avg_monthly_pnl': float(self.monthly_sums.mean()),
+                'monthly_breakdown': dict(zip(self.monthly_keys, self.monthly_sums))
             }
-        
+
         return {
             'daily': daily_stats,
             'hourly': hourly_stats,
             'monthly': monthly_stats
         }
-    
+
     def analyze_transaction_types(self):
         """Analyze performance by transaction type"""
         type_analysis = {}
-        
-        for tx_type, total_pnl in self.type_pnl.items():
-            count = self.type_counts[tx_type]
-            type_records = [r for r in self.data if r['type'] == tx_type]
-            type_pnl_values = [float(r['pnl']) for r in type_records]
-            
+
+        # Single hashed groupby pass instead of one full scan per type
+        types_cat = pd.Categorical.from_codes(self.type_codes, categories=self.type_names)
+        agg = pd.Series(self.pnl_values).groupby(types_cat, observed=True).agg(
+            ['sum', 'count', 'mean', 'min', 'max', 'std'])
+
+        for tx_type, row in agg.iterrows():
+            count = int(row['count'])
             type_analysis[tx_type] = {
-                'total_pnl': float(total_pnl),
+                'total_pnl': float(row['sum']),
                 'count': count,
-                'avg_pnl': float(total_pnl) / count if count > 0 else 0,
-                'min_pnl': min(type_pnl_values) if type_pnl_values else 0,
-                'max_pnl': max(type_pnl_values) if type_pnl_values else 0,
-                'std_dev': statistics.stdev(type_pnl_values) if len(type_pnl_values) > 1 else 0,
-                'contribution_percent': float(total_pnl) / float(self.total_pnl) * 100 if self.total_pnl != 0 else 0
+                'avg_pnl': float(row['mean']),
+                'min_pnl': float(row['min']),
+                'max_pnl': float(row['max']),
+                'std_dev': float(row['std']) if count > 1 else 0,
+                'contribution_percent': float(row['sum']) / self.total_pnl * 100 if self.total_pnl != 0 else 0
             }
-        
+
         return type_analysis
-    
+
     def generate_summary_report(self):
         """Generate comprehensive summary report"""
         print("=" * 80)
         print("COMPREHENSIVE PNL ANALYSIS REPORT")
         print("=" * 80)
-        
+
         # Basic information
         print(f"\nFILES ANALYZED: {len(self.csv_files)}")
         for i, csv_file in enumerate(self.csv_files, 1):
             stats = self.file_stats.get(csv_file, {})
             print(f"  {i}. {csv_file}")
             print(f"     Records: {stats.get('total_records', 0):,}, Valid: {stats.get('valid_records', 0):,}")
-        
+
         print(f"\nANALYSIS DATE: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print(f"TOTAL RECORDS: {self.record_count:,}")
         print(f"VALID PNL RECORDS: {self.valid_pnl_count:,}")
-        print(f"INVALID RECORDS: {len(self.invalid_records):,}")
-        
-        if self.data:
-            date_range = f"{min(r['timestamp'] for r in self.data).date()} to {max(r['timestamp'] for r in self.data).date()}"
-            print(f"DATE RANGE: {date_range}")
-        
+        print(f"INVALID RECORDS: {self.invalid_record_count:,}")
+
+        if self.first_ts is not None:
+            first_date = self.first_ts.astype('datetime64[D]')
+            last_date = self.last_ts.astype('datetime64[D]')
+            print(f"DATE RANGE: {first_date} to {last_date}")
+
         # Overall statistics
         stats = self.calculate_statistics()
         print(f"\n{'='*50}")
@@ -295,7 +524,7 @@ class PNLAnalyzer:
         print(f"90th Percentile:     ${stats['percentile_90']:,.6f}")
         print(f"95th Percentile:     ${stats['percentile_95']:,.6f}")
         print(f"99th Percentile:     ${stats['percentile_99']:,.6f}")
-        
+
         # Profit/Loss analysis
         pl_analysis = self.analyze_profit_loss()
         print(f"\n{'='*50}")
@@ -311,13 +540,13 @@ class PNLAnalyzer:
         print(f"Largest Profit:          ${pl_analysis['largest_profit']:,.6f}")
         print(f"Largest Loss:            ${pl_analysis['largest_loss']:,.6f}")
         print(f"Profit/Loss Ratio:       {pl_analysis['profit_loss_ratio']:.2f}")
-        
+
         # Time-based analysis
         time_analysis = self.analyze_time_performance()
         print(f"\n{'='*50}")
         print("TIME-BASED PERFORMANCE")
         print(f"{'='*50}")
-        
+
         if time_analysis['daily']:
             daily = time_analysis['daily']
             print(f"Best Day:     {daily['best_day'][0]} (${float(daily['best_day'][1]):,.2f})")
@@ -325,57 +554,57 @@ class PNLAnalyzer:
             print(f"Avg Daily:    ${daily['avg_daily_pnl']:,.2f}")
             print(f"Daily Volatility: ${daily['daily_volatility']:,.2f}")
             print(f"Profitable Days: {daily['profitable_days']}/{daily['total_days']} ({daily['profitable_days']/daily['total_days']*100:.1f}%)")
-        
+
         if time_analysis['hourly']:
             hourly = time_analysis['hourly']
             print(f"Best Hour:    {hourly['best_hour'][0]:02d}:00 (${float(hourly['best_hour'][1]):,.2f})")
             print(f"Worst Hour:   {hourly['worst_hour'][0]:02d}:00 (${float(hourly['worst_hour'][1]):,.2f})")
-        
+
         if time_analysis['monthly']:
             monthly = time_analysis['monthly']
             print(f"Best Month:   {monthly['best_month'][0]} (${float(monthly['best_month'][1]):,.2f})")
             print(f"Worst Month:  {monthly['worst_month'][0]} (${float(monthly['worst_month'][1]):,.2f})")
             print(f"Avg Monthly:  ${monthly['avg_monthly_pnl']:,.2f}")
-        
+
         # Transaction type analysis
         type_analysis = self.analyze_transaction_types()
         print(f"\n{'='*50}")
         print("TRANSACTION TYPE ANALYSIS")
         print(f"{'='*50}")
-        
+
         # Sort by total PNL descending
         sorted_types = sorted(type_analysis.items(), key=lambda x: x[1]['total_pnl'], reverse=True)
-        
+
         print(f"{'Type':<40} {'Total PNL':<15} {'Count':<10} {'Avg PNL':<12} {'Contribution':<12}")
         print("-" * 90)
-        
+
         for tx_type, data in sorted_types[:20]:  # Show top 20
             print(f"{tx_type:<40} ${data['total_pnl']:>10,.2f} {data['count']:>8,} ${data['avg_pnl']:>8,.4f} {data['contribution_percent']:>8.2f}%")
-        
+
         if len(sorted_types) > 20:
             print(f"... and {len(sorted_types) - 20} more transaction types")
-        
+
         # Data quality report
-        if self.invalid_records:
+        if self.invalid_record_count:
             print(f"\n{'='*50}")
             print("DATA QUALITY ISSUES")
             print(f"{'='*50}")
-            print(f"Invalid records found: {len(self.invalid_records)}")
+            print(f"Invalid records found: {self.invalid_record_count}")
             print("Sample invalid records:")
             for record in self.invalid_records[:5]:
                 print(f"  Row {record['row_number']} in {record['source_file']}: {record['error']}")
-        
+
         # File breakdown
-        if len(self.csv_files) > 1:
+        if len(self.csv_files) > 1 and len(self.src_arr):
             print(f"\n{'='*50}")
             print("FILE BREAKDOWN")
             print(f"{'='*50}")
-            for csv_file, stats in self.file_stats.items():
-                file_data = [r for r in self.data if r['source_file'] == csv_file]
-                if file_data:
-                    file_pnl = sum(float(r['pnl']) for r in file_data)
-                    print(f"{Path(csv_file).name:<30} ${file_pnl:>12,.2f} ({len(file_data):,} records)")
-    
+            file_sums = np.bincount(self.src_arr, weights=self.pnl_values,
+                                    minlength=len(self.file_names))
+            file_counts = np.bincount(self.src_arr, minlength=len(self.file_names))
+            for file_idx, csv_file in enumerate(self.file_names):
+                print(f"{Path(csv_file).name:<30} ${file_sums[file_idx]:>12,.2f} ({file_counts[file_idx]:,} records)")
+
     def export_detailed_analysis(self, output_file):
         """Export detailed analysis to JSON file"""
         analysis_data = {
@@ -384,7 +613,7 @@ class PNLAnalyzer:
                 'analysis_date': datetime.now().isoformat(),
                 'total_records': self.record_count,
                 'valid_records': self.valid_pnl_count,
-                'invalid_records': len(self.invalid_records)
+                'invalid_records': self.invalid_record_count
             },
             'overall_statistics': self.calculate_statistics(),
             'profit_loss_analysis': self.analyze_profit_loss(),
@@ -392,183 +621,135 @@ class PNLAnalyzer:
             'transaction_type_analysis': self.analyze_transaction_types(),
             'data_quality_issues': self.invalid_records[:100]  # Limit to first 100
         }
-        
-        # Convert Decimal objects to float for JSON serialization
-        def decimal_to_float(obj):
-            if isinstance(obj, Decimal):
-                return float(obj)
-            elif isinstance(obj, dict):
-                return {k: decimal_to_float(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [decimal_to_float(item) for item in obj]
-            elif isinstance(obj, datetime):
-                return obj.isoformat()
-            else:
-                return obj
-        
-        analysis_data = decimal_to_float(analysis_data)
-        
-        with open(output_file, 'w') as f:
-            json.dump(analysis_data, f, indent=2, default=str)
-        
+
+        # orjson serializes numpy scalars and dates natively, so no recursive
+        # copy of the analysis tree is needed
+        with open(output_file, 'wb') as f:
+            f.write(orjson.dumps(
+                analysis_data,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+                default=str))
+
         print(f"\nDetailed analysis exported to: {output_file}")
-    
+
     def export_monthly_csv_report(self, output_file=None):
         """Export monthly breakdown CSV report with revenue categories"""
         if not output_file:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             output_file = f"monthly_pnl_report_{timestamp}.csv"
-        
-        # Define revenue sources (including all possible revenue event types)
-        revenue_sources = ['doghouse', 'lottery', 'pumpup', 'raffle', 'bucket_staking',
-                          'suilotto_bucket_interest', 'unihouse_reward', 'gas_rebates',
-                          'interest_withdraw', 'liquid-staking']
-        
-        # Initialize monthly data structure
+
+        # Per-month category totals were accumulated during ingestion; turn the
+        # dense vectors back into keyed rows here
         monthly_data = OrderedDict()
-        
-        # Process data by month
-        for record in self.data:
-            month_key = record['timestamp'].strftime('%Y-%m')
-            
-            if month_key not in monthly_data:
-                monthly_data[month_key] = {
-                    'Pre-Unihouse PNL': Decimal('0'),
-                    'Staking PNL': Decimal('0'),
-                    'Fee PNL': Decimal('0'),
-                    'Referral Fee': Decimal('0')
-                }
-                # Initialize revenue sources
-                for source in revenue_sources:
-                    monthly_data[month_key][f'Revenue_{source}'] = Decimal('0')
-            
-            # Categorize the transaction
-            tx_type = record['type']
-            pnl = record['pnl']
-            
-            if tx_type.startswith('Pre-Unihouse:'):
-                monthly_data[month_key]['Pre-Unihouse PNL'] += pnl
-            elif tx_type == 'Staking Revenue':
-                monthly_data[month_key]['Staking PNL'] += pnl
-            elif tx_type == 'Fee Revenue':
-                monthly_data[month_key]['Fee PNL'] += pnl
-            elif tx_type == 'Referral Fee':
-                monthly_data[month_key]['Referral Fee'] += pnl
-            elif tx_type.startswith('Revenue Event:'):
-                # Extract revenue source
-                source = tx_type.replace('Revenue Event:', '')
-                if source in revenue_sources:
-                    monthly_data[month_key][f'Revenue_{source}'] += pnl
-        
+        for month in sorted(self.monthly_category_pnl):
+            totals_vector = self.monthly_category_pnl[month]
+            monthly_data[month] = dict(zip(MONTHLY_CATEGORY_FIELDS, totals_vector))
+
         # Write CSV file
         with open(output_file, 'w', newline='') as csvfile:
             # Define column headers
             fieldnames = ['Month', 'Pre-Unihouse PNL']
-            for source in revenue_sources:
+            for source in REVENUE_SOURCES:
                 fieldnames.append(f'Revenue_{source}')
             fieldnames.extend(['Revenue_Total', 'Staking PNL', 'Fee PNL', 'Referral Fee', 'Total PNL'])
-            
+
             writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
             writer.writeheader()
-            
-            # Initialize totals
-            totals = {field: Decimal('0') for field in fieldnames if field != 'Month'}
-            
+
+            # Accumulate the unrounded per-month values so the totals row
+            # matches the summary report to the cent; rounding happens only
+            # when a cell is formatted
+            totals = {field: 0.0 for field in fieldnames if field != 'Month'}
+
             # Write monthly rows
             for month, data in monthly_data.items():
                 row = {'Month': month}
-                
+
                 # Add main categories
-                row['Pre-Unihouse PNL'] = f"{float(data['Pre-Unihouse PNL']):.2f}"
+                row['Pre-Unihouse PNL'] = f"{data['Pre-Unihouse PNL']:.2f}"
                 totals['Pre-Unihouse PNL'] += data['Pre-Unihouse PNL']
-                
+
                 # Add revenue sources
-                revenue_total = Decimal('0')
-                for source in revenue_sources:
+                revenue_total = 0.0
+                for source in REVENUE_SOURCES:
                     key = f'Revenue_{source}'
-                    value = data.get(key, Decimal('0'))
-                    row[key] = f"{float(value):.2f}"
+                    value = data.get(key, 0.0)
+                    row[key] = f"{value:.2f}"
                     revenue_total += value
                     totals[key] += value
-                
+
                 # Add revenue total
-                row['Revenue_Total'] = f"{float(revenue_total):.2f}"
+                row['Revenue_Total'] = f"{revenue_total:.2f}"
                 totals['Revenue_Total'] += revenue_total
-                
+
                 # Add other categories
-                row['Staking PNL'] = f"{float(data['Staking PNL']):.2f}"
-                row['Fee PNL'] = f"{float(data['Fee PNL']):.2f}"
-                row['Referral Fee'] = f"{float(data['Referral Fee']):.2f}"
-                
+                row['Staking PNL'] = f"{data['Staking PNL']:.2f}"
+                row['Fee PNL'] = f"{data['Fee PNL']:.2f}"
+                row['Referral Fee'] = f"{data['Referral Fee']:.2f}"
+
                 totals['Staking PNL'] += data['Staking PNL']
                 totals['Fee PNL'] += data['Fee PNL']
                 totals['Referral Fee'] += data['Referral Fee']
-                
+
                 # Calculate total PNL
-                total_pnl = (data['Pre-Unihouse PNL'] + revenue_total + 
+                total_pnl = (data['Pre-Unihouse PNL'] + revenue_total +
                             data['Staking PNL'] + data['Fee PNL'] + data['Referral Fee'])
-                row['Total PNL'] = f"{float(total_pnl):.2f}"
+                row['Total PNL'] = f"{total_pnl:.2f}"
                 totals['Total PNL'] += total_pnl
-                
+
                 writer.writerow(row)
-            
+
             # Write totals row
             total_row = {'Month': 'Total'}
             for field in fieldnames[1:]:  # Skip 'Month'
-                total_row[field] = f"{float(totals[field]):.2f}"
+                total_row[field] = f"{totals[field]:.2f}"
             writer.writerow(total_row)
-        
+
         print(f"\nMonthly CSV report exported to: {output_file}")
-    
+
     def run_analysis(self, export_json=False, export_monthly_csv=False):
         """Run complete analysis"""
         if not self.load_data():
             return False
-        
+
         if self.valid_pnl_count == 0:
             print("No valid PNL data found!")
             return False
-        
+
         # Generate summary report
         self.generate_summary_report()
-        
+
         # Export detailed analysis if requested
         if export_json:
             base_name = Path(self.csv_files[0]).stem
             output_file = f"{base_name}_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
             self.export_detailed_analysis(output_file)
-        
+
         # Export monthly CSV report if requested
         if export_monthly_csv:
             self.export_monthly_csv_report()
-        
+
         return True
 
+# One pattern covering the old chunk_*/chunk*/*chunk*/part_*/part* globs
+CHUNK_FILE_RE = re.compile(r'(?:.*chunk.*|part.*)\.csv$')
+NATURAL_SORT_RE = re.compile(r'([0-9]+)')
+
 def detect_chunk_files():
     """Automatically detect chunk files in the current directory"""
-    chunk_patterns = [
-        'chunk_*.csv',
-        'chunk*.csv',
-        '*chunk*.csv',
-        'part_*.csv',
-        'part*.csv'
-    ]
-    
-    chunk_files = set()  # Use set to avoid duplicates
-    for pattern in chunk_patterns:
-        files = glob.glob(pattern)
-        if files:
-            chunk_files.update(files)
-    
-    # Convert back to list and sort naturally (chunk_1, chunk_2, etc.)
-    chunk_files = list(chunk_files)
-    chunk_files.sort(key=lambda x: [int(c) if c.isdigit() else c for c in re.split('([0-9]+)', x)])
-    
+    # One directory read and one regex instead of five overlapping globs
+    chunk_files = [entry.name for entry in os.scandir('.')
+                   if entry.is_file() and CHUNK_FILE_RE.match(entry.name)]
+
+    # Sort naturally (chunk_1, chunk_2, etc.)
+    chunk_files.sort(key=lambda x: [int(c) if c.isdigit() else c
+                                    for c in NATURAL_SORT_RE.split(x)])
+
     return chunk_files
 
 def main():
     parser = argparse.ArgumentParser(description='Advanced PNL Analysis Tool - Multi-file Support')
-    parser.add_argument('csv_files', nargs='*', 
+    parser.add_argument('csv_files', nargs='*',
                        help='CSV files to analyze (supports multiple files)')
     parser.add_argument('--export-json', action='store_true',
                        help='Export detailed analysis to JSON file')
@@ -577,12 +758,12 @@ def main():
     parser.add_argument('--auto-chunks', action='store_true',
                        help='Automatically detect and process chunk files')
     parser.add_argument('--version', action='version', version='PNL Analyzer 2.1')
-    
+
     args = parser.parse_args()
-    
+
     # Determine which files to process
     csv_files = []
-    
+
     if args.auto_chunks:
         chunk_files = detect_chunk_files()
         if chunk_files:
@@ -592,7 +773,7 @@ def main():
             csv_files = chunk_files
         else:
             print("No chunk files found. Looking for default file...")
-    
+
     if not csv_files:
         if args.csv_files:
             csv_files = args.csv_files
@@ -608,17 +789,17 @@ def main():
                 print("  python3 GetTotalPNL.py --auto-chunks        # Auto-detect chunk files")
                 print("  python3 GetTotalPNL.py                      # Use default file")
                 sys.exit(1)
-    
+
     # Validate all files exist
     missing_files = [f for f in csv_files if not Path(f).exists()]
     if missing_files:
         print(f"Error: Files not found: {missing_files}")
         sys.exit(1)
-    
+
     analyzer = PNLAnalyzer(csv_files)
-    
+
     try:
-        success = analyzer.run_analysis(export_json=args.export_json, 
+        success = analyzer.run_analysis(export_json=args.export_json,
                                        export_monthly_csv=args.export_monthly_csv)
         if not success:
             sys.exit(1)
@@ -630,4 +811,4 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()